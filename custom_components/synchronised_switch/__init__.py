@@ -0,0 +1,97 @@
+"""Synchronised Switch group integration"""
+
+import time
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    ATTR_DURATION,
+    ATTR_PSTATS,
+    DEFAULT_PROFILE_DURATION,
+    DOMAIN,
+    EVENT_PROFILE_COMPLETE,
+    MAX_PROFILE_DURATION,
+    SERVICE_PROFILE,
+)
+from .profiler import SyncProfiler
+from .registry import SyncGroupRegistry
+from .websocket import async_setup_websocket
+
+CONFIG_SCHEMA = cv.platform_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_PSTATS, default=False): cv.boolean,
+    }
+)
+
+
+async def async_setup(
+    hass: HomeAssistant,
+    config: ConfigType,  # pylint: disable=unused-argument
+) -> bool:
+    """Register the integration services and WebSocket commands
+
+    The groups themselves are set up by the switch platform.
+    """
+
+    # only one profiling window at a time
+    running: set[SyncProfiler] = set()
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Time the synchronisation hot path of the groups for a while"""
+        if running:
+            raise HomeAssistantError("a profiling of synchronised groups is running")
+
+        registry: SyncGroupRegistry | None = hass.data.get(DOMAIN)
+        groups = registry.groups() if registry is not None else []
+        if ATTR_ENTITY_ID in call.data:
+            groups = [
+                group
+                for group in groups
+                if group.entity_id in call.data[ATTR_ENTITY_ID]
+            ]
+        if not groups:
+            raise HomeAssistantError("no synchronised groups to profile")
+
+        pstats_path = (
+            hass.config.path(f"{DOMAIN}_profile.{int(time.time())}.pstats")
+            if call.data[ATTR_PSTATS]
+            else None
+        )
+        profiler = SyncProfiler(hass, groups, call.data[ATTR_DURATION], pstats_path)
+
+        running.add(profiler)
+        try:
+            summary = await profiler.async_run()
+        finally:
+            running.discard(profiler)
+
+        hass.bus.async_fire(EVENT_PROFILE_COMPLETE, summary)
+        return summary
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async_setup_websocket(hass)
+
+    return True
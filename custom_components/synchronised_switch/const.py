@@ -5,7 +5,7 @@ from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.helpers import config_validation as cv
 
-from homeassistant.const import CONF_NAME, CONF_ENTITIES
+from homeassistant.const import CONF_NAME, CONF_ENTITIES, CONF_OPTIMISTIC
 
 import voluptuous as vol
 
@@ -17,8 +17,48 @@ DOMAIN = "synchronised_switch"
 # The list of DOMAINs supported for entities managed by the group.
 SUPPORTED_DOMAINS = [SWITCH_DOMAIN, LIGHT_DOMAIN]
 
-# schema is the same of the GroupSwitch schema
+# Seconds an optimistic group state waits for the master to confirm it
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+DEFAULT_CONFIRM_TIMEOUT = 5.0
+
+# Fired when an optimistic group state is not confirmed by the master, and rolled back
+EVENT_CONFIRMATION_FAILED = f"{DOMAIN}_confirmation_failed"
+
+# Retries of the commands failed by some members of the group
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_RETRY_DELAY = "retry_delay"
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+# group attribute listing the members which failed the last command
+ATTR_FAILED_ENTITIES = "failed_entities"
+
+# Profiling of the synchronisation hot path, see profiler.py
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+ATTR_PSTATS = "pstats"
+DEFAULT_PROFILE_DURATION = 60.0
+MAX_PROFILE_DURATION = 3600.0
+EVENT_PROFILE_COMPLETE = f"{DOMAIN}_profile_complete"
+
+# Transition records streamed to WebSocket subscribers, see websocket.py
+SIGNAL_TRANSITION = f"{DOMAIN}_transition"
+ATTR_THROTTLE = "throttle"
+DEFAULT_THROTTLE = 0.5
+MAX_THROTTLE = 60.0
+
+# schema is the same of the GroupSwitch schema, plus the optimistic mode options
 PLATFORM_SCHEMA: dict[vol.Marker, Any] = {
     vol.Required(CONF_NAME): cv.string,
     vol.Required(CONF_ENTITIES): cv.entities_domain(SUPPORTED_DOMAINS),
+    vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+    vol.Optional(CONF_CONFIRM_TIMEOUT, default=DEFAULT_CONFIRM_TIMEOUT): vol.All(
+        vol.Coerce(float), vol.Range(min=0.1)
+    ),
+    vol.Optional(CONF_RETRY_ATTEMPTS, default=DEFAULT_RETRY_ATTEMPTS): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=10)
+    ),
+    vol.Optional(CONF_RETRY_DELAY, default=DEFAULT_RETRY_DELAY): vol.All(
+        vol.Coerce(float), vol.Range(min=0.1, max=MAX_RETRY_DELAY)
+    ),
 }
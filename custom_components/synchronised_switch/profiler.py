@@ -0,0 +1,192 @@
+"""On-demand profiling of the synchronisation hot path of the groups
+
+While a profiling window is open, the instrumented methods of the selected
+group entities are shadowed by timing wrappers set on the instances; when the
+window closes the wrappers are deleted and the class methods are used again.
+When no profiling is running nothing is wrapped, so there is no overhead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from .synchronised_switch import SyncSwitchGroup
+
+_LOGGER = logging.getLogger(__name__)
+
+# metric name -> methods of the group entity timed for it
+METRIC_HANDLER = "event_handler"
+METRIC_SERVICE_CALL = "service_call"
+METRIC_UPDATE = "async_update"
+
+_SYNC_METHODS = {
+    "_master_changed": METRIC_HANDLER,
+    "_slave_changed": METRIC_HANDLER,
+}
+_ASYNC_METHODS = {
+    "_async_call_service": METRIC_SERVICE_CALL,
+    "async_update": METRIC_UPDATE,
+}
+
+
+# durations kept per metric for the percentiles: count, total and max are exact
+RESERVOIR_SIZE = 1024
+
+
+class DurationSamples:
+    """Running count, total and max of the durations, and a bounded random sample of them
+
+    The sample is a reservoir: every duration has the same chance to be kept,
+    so the memory used does not grow with the length of the window.
+    """
+
+    __slots__ = ("count", "total", "max", "reservoir")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reservoir: list[float] = []
+
+    def add(self, duration: float) -> None:
+        """Record a duration, in seconds"""
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < RESERVOIR_SIZE:
+                self.reservoir[index] = duration
+
+
+def _timed(func: Callable[..., Any], samples: DurationSamples) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.add(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _async_timed(
+    func: Callable[..., Any], samples: DurationSamples
+) -> Callable[..., Any]:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            samples.add(time.perf_counter() - start)
+
+    return wrapper
+
+
+def summarise(samples: DurationSamples) -> dict[str, float | int]:
+    """Count and distribution, in milliseconds, of the durations sampled
+
+    The 95th percentile is estimated on the reservoir.
+    """
+    if not samples.count:
+        return {"count": 0}
+
+    ordered = sorted(samples.reservoir)
+    kept = len(ordered)
+    return {
+        "count": samples.count,
+        "total_ms": round(samples.total * 1000, 3),
+        "mean_ms": round(samples.total / samples.count * 1000, 3),
+        "p95_ms": round(ordered[min(kept - 1, int(kept * 0.95))] * 1000, 3),
+        "max_ms": round(samples.max * 1000, 3),
+    }
+
+
+class SyncProfiler:
+    """A time-boxed profiling window over some groups"""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        groups: list[SyncSwitchGroup],
+        duration: float,
+        pstats_path: str | None = None,
+    ) -> None:
+        self.hass = hass
+        self._groups = groups
+        self._duration = duration
+        self._pstats_path = pstats_path
+        # group entity-id -> metric -> durations in seconds
+        self._samples: dict[str, dict[str, DurationSamples]] = {}
+
+    def _install(self) -> None:
+        for group in self._groups:
+            metrics: dict[str, DurationSamples] = {}
+            self._samples[group.entity_id] = metrics
+            for name, metric in _SYNC_METHODS.items():
+                samples = metrics.setdefault(metric, DurationSamples())
+                setattr(group, name, _timed(getattr(group, name), samples))
+            for name, metric in _ASYNC_METHODS.items():
+                samples = metrics.setdefault(metric, DurationSamples())
+                setattr(group, name, _async_timed(getattr(group, name), samples))
+
+    def _uninstall(self) -> None:
+        for group in self._groups:
+            for name in (*_SYNC_METHODS, *_ASYNC_METHODS):
+                group.__dict__.pop(name, None)
+
+    async def async_run(self) -> dict[str, Any]:
+        """Profile for the whole window, and return the summary of the samples"""
+        _LOGGER.info(
+            "profiling %d synchronised groups for %s seconds",
+            len(self._groups),
+            self._duration,
+        )
+        profile = cProfile.Profile() if self._pstats_path else None
+
+        try:
+            # installed within the try: the wrappers are removed even if
+            # enabling the profile fails (e.g. another profiler is active)
+            self._install()
+            if profile is not None:
+                profile.enable()
+            await asyncio.sleep(self._duration)
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._uninstall()
+
+        summary: dict[str, Any] = {
+            "duration": self._duration,
+            "groups": {
+                entity_id: {
+                    metric: summarise(samples) for metric, samples in metrics.items()
+                }
+                for entity_id, metrics in self._samples.items()
+            },
+        }
+
+        if profile is not None:
+            await self.hass.async_add_executor_job(
+                profile.dump_stats, self._pstats_path
+            )
+            summary["pstats"] = self._pstats_path
+
+        _LOGGER.info("synchronised groups profile: %s", summary)
+        return summary
@@ -0,0 +1,291 @@
+"""Shared registry of the Synchronised Switch groups and of their members
+
+All the groups of a Home Assistant instance share one registry, which holds
+the membership of every group in compact tables:
+
+- each member entity-id is interned once and referred to by an integer index,
+  even when the entity belongs to more than one group;
+- per-member data (domain, last known status, owning group) is stored in
+  byte/int arrays indexed by the member index;
+- each group occupies a slot, holding an array of member indices, master first.
+
+Members are dropped, and their index reused, when no group holds them anymore.
+
+A single state_changed listener feeds all the groups: the registry dispatches
+each event of a member to the group entities owning it.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+from .const import DOMAIN, SUPPORTED_DOMAINS
+
+if TYPE_CHECKING:
+    from .synchronised_switch import SyncSwitchGroup
+
+_LOGGER = logging.getLogger(__name__)
+
+# Member status codes, stored one byte per member.
+STATUS_UNKNOWN = 0
+STATUS_OFF = 1
+STATUS_ON = 2
+
+_STATE_STATUS: dict[str, int] = {STATE_OFF: STATUS_OFF, STATE_ON: STATUS_ON}
+
+# Marks a member which does not belong to any group.
+_NO_GROUP = -1
+
+
+class SyncGroupRegistry:
+    """Membership and per-member status of all the synchronised groups"""
+
+    __slots__ = (
+        "_free_members",
+        "_free_slots",
+        "_group_members",
+        "_groups",
+        "_member_domain",
+        "_member_extra_groups",
+        "_member_group",
+        "_member_ids",
+        "_member_index",
+        "_member_status",
+        "_unsubscribe",
+        "hass",
+        "transition_subscribers",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        # number of WebSocket clients following the transitions: while none,
+        # the groups do not record their transitions.
+        self.transition_subscribers = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # member index -> entity-id ("" for a dropped member), and its inverse
+        self._member_ids: list[str] = []
+        self._member_index: dict[str, int] = {}
+        # indices of the dropped members, reused for new members
+        self._free_members: list[int] = []
+        # member index -> index in SUPPORTED_DOMAINS
+        self._member_domain = bytearray()
+        # member index -> STATUS_* code of its last known state
+        self._member_status = bytearray()
+        # member index -> first group slot owning it, or _NO_GROUP.
+        # A member is rarely in more than one group: further slots are kept aside.
+        self._member_group = array("i")
+        self._member_extra_groups: dict[int, list[int]] = {}
+        # group slot -> member indices, master first (None for a free slot)
+        self._group_members: list[array | None] = []
+        self._groups: list[SyncSwitchGroup | None] = []
+        self._free_slots: list[int] = []
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        """Number of groups registered"""
+        return len(self._groups) - len(self._free_slots)
+
+    @property
+    def member_count(self) -> int:
+        """Number of distinct member entities interned"""
+        return len(self._member_index)
+
+    def _intern(self, entity_id: str) -> int:
+        """Index of the member, adding it to the member tables if new"""
+        index = self._member_index.get(entity_id)
+        if index is not None:
+            return index
+
+        entity_id = sys.intern(entity_id)
+        domain = SUPPORTED_DOMAINS.index(entity_id.split(".", 1)[0])
+        state = self.hass.states.get(entity_id)
+        status = (
+            STATUS_UNKNOWN
+            if state is None
+            else _STATE_STATUS.get(state.state, STATUS_UNKNOWN)
+        )
+
+        if self._free_members:
+            index = self._free_members.pop()
+            self._member_ids[index] = entity_id
+            self._member_domain[index] = domain
+            self._member_status[index] = status
+            self._member_group[index] = _NO_GROUP
+        else:
+            index = len(self._member_ids)
+            self._member_ids.append(entity_id)
+            self._member_domain.append(domain)
+            self._member_status.append(status)
+            self._member_group.append(_NO_GROUP)
+        self._member_index[entity_id] = index
+        return index
+
+    def _drop(self, index: int) -> None:
+        """Forget a member no group holds anymore, freeing its index"""
+        del self._member_index[self._member_ids[index]]
+        self._member_ids[index] = ""
+        self._member_status[index] = STATUS_UNKNOWN
+        self._free_members.append(index)
+
+    @callback
+    def async_add_group(self, group: SyncSwitchGroup, entity_ids: list[str]) -> int:
+        """Register a group and its members (master first), returning its slot
+
+        The state_changed listener is set up with the first group.
+        """
+        members = array("I", [self._intern(entity_id) for entity_id in entity_ids])
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._group_members[slot] = members
+            self._groups[slot] = group
+        else:
+            slot = len(self._groups)
+            self._group_members.append(members)
+            self._groups.append(group)
+
+        for index in members:
+            if self._member_group[index] == _NO_GROUP:
+                self._member_group[index] = slot
+            else:
+                self._member_extra_groups.setdefault(index, []).append(slot)
+
+        if self._unsubscribe is None:
+            self._unsubscribe = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_member_changed,
+                event_filter=self._async_is_member,
+            )
+
+        return slot
+
+    @callback
+    def async_remove_group(self, slot: int) -> None:
+        """Unregister the group in the slot
+
+        Members held by no other group are dropped; when the last group is removed
+        the listener is cancelled and the tables released.
+        """
+        members = self._group_members[slot]
+        if members is None:
+            return
+
+        for index in members:
+            extra = self._member_extra_groups.get(index)
+            if self._member_group[index] == slot:
+                self._member_group[index] = extra.pop(0) if extra else _NO_GROUP
+            elif extra:
+                extra.remove(slot)
+            if extra is not None and not extra:
+                del self._member_extra_groups[index]
+            if self._member_group[index] == _NO_GROUP and self._member_ids[index]:
+                self._drop(index)
+
+        self._group_members[slot] = None
+        self._groups[slot] = None
+        self._free_slots.append(slot)
+
+        if not len(self):
+            self.async_clear()
+
+    @callback
+    def async_clear(self) -> None:
+        """Cancel the state_changed listener and drop all groups and members"""
+        _LOGGER.debug("Unsubscribing all synchronised groups members events handlers")
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        self._reset()
+
+    def groups(self) -> list[SyncSwitchGroup]:
+        """The group entities registered"""
+        return [group for group in self._groups if group is not None]
+
+    def master_id(self, slot: int) -> str:
+        """Entity-id of the master of the group"""
+        return self._member_ids[self._group_members[slot][0]]
+
+    def entity_ids(self, slot: int, domain: str | None = None) -> list[str]:
+        """Entity-ids of the non-master members of the group, optionally of one domain only"""
+        member_ids = self._member_ids
+        members = self._group_members[slot]
+        if domain is None:
+            return [member_ids[index] for index in members[1:]]
+
+        domain_code = SUPPORTED_DOMAINS.index(domain)
+        member_domain = self._member_domain
+        return [
+            member_ids[index]
+            for index in members[1:]
+            if member_domain[index] == domain_code
+        ]
+
+    def member_status(self, entity_id: str) -> int:
+        """STATUS_* code of the last state seen for the member"""
+        index = self._member_index.get(entity_id)
+        return STATUS_UNKNOWN if index is None else self._member_status[index]
+
+    def member_in_state(self, entity_id: str, state: str) -> bool:
+        """Whether the last state seen for the member is the on/off state given"""
+        status = _STATE_STATUS.get(state)
+        return status is not None and self.member_status(entity_id) == status
+
+    @callback
+    def _async_is_member(self, event_data: EventStateChangedData) -> bool:
+        """Filter the state_changed events of the members"""
+        return event_data["entity_id"] in self._member_index
+
+    @callback
+    def _async_member_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Record the member status and dispatch the event to the groups owning it"""
+        data = event.data
+        index = self._member_index.get(data["entity_id"])
+        if index is None:
+            return
+
+        new_state = data["new_state"]
+        self._member_status[index] = (
+            STATUS_UNKNOWN
+            if new_state is None
+            else _STATE_STATUS.get(new_state.state, STATUS_UNKNOWN)
+        )
+
+        slot = self._member_group[index]
+        if slot != _NO_GROUP:
+            self._dispatch(slot, index, event)
+
+            extra = self._member_extra_groups.get(index)
+            if extra is not None:
+                for slot in extra:
+                    self._dispatch(slot, index, event)
+
+    def _dispatch(
+        self, slot: int, index: int, event: Event[EventStateChangedData]
+    ) -> None:
+        group = self._groups[slot]
+        if self._group_members[slot][0] == index:
+            group._master_changed(event)  # pylint: disable=protected-access
+        else:
+            group._slave_changed(event)  # pylint: disable=protected-access
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> SyncGroupRegistry:
+    """The registry of the groups of this Home Assistant instance, created on first use"""
+    registry: SyncGroupRegistry | None = hass.data.get(DOMAIN)
+    if registry is None:
+        registry = hass.data[DOMAIN] = SyncGroupRegistry(hass)
+    return registry
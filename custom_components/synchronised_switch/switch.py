@@ -13,8 +13,15 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .const import (
+    CONF_CONFIRM_TIMEOUT,
     CONF_NAME,
     CONF_ENTITIES,
+    CONF_OPTIMISTIC,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_DELAY,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_DELAY,
     DOMAIN,
     PLATFORM_SCHEMA as DOMAIN_PLATFORM_SCHEMA,
 )
@@ -51,6 +58,10 @@ async def async_setup_platform(
         name=config[CONF_NAME],
         unique_id=entity_id,
         entity_ids=config[CONF_ENTITIES],
+        optimistic=config[CONF_OPTIMISTIC],
+        confirm_timeout=config[CONF_CONFIRM_TIMEOUT],
+        retry_attempts=config[CONF_RETRY_ATTEMPTS],
+        retry_delay=config[CONF_RETRY_DELAY],
     )
 
     async_add_entities([setup_entity], update_before_add=False)
@@ -83,6 +94,14 @@ async def async_setup_entry(
         unique_id=config_entry.entry_id,
         name=config_entry.title,
         entity_ids=entities,
+        optimistic=config_entry.options.get(CONF_OPTIMISTIC, False),
+        confirm_timeout=config_entry.options.get(
+            CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT
+        ),
+        retry_attempts=config_entry.options.get(
+            CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS
+        ),
+        retry_delay=config_entry.options.get(CONF_RETRY_DELAY, DEFAULT_RETRY_DELAY),
     )
 
     async_add_entities([setup_entity], update_before_add=True)
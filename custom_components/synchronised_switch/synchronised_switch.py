@@ -3,13 +3,15 @@
 import asyncio
 
 import logging
+import random
 
 from typing import Any, Literal
-from functools import partial
 
 from propcache import cached_property
 
 from homeassistant.core import (
+    CALLBACK_TYPE,
+    Context,
     Event,
     EventStateChangedData,
     State,
@@ -17,7 +19,8 @@ from homeassistant.core import (
 )
 
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -27,10 +30,31 @@ from homeassistant.const import (
     STATE_OFF,
 )
 
-from .const import SUPPORTED_DOMAINS
+from .const import (
+    ATTR_FAILED_ENTITIES,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_DELAY,
+    EVENT_CONFIRMATION_FAILED,
+    MAX_RETRY_DELAY,
+    SUPPORTED_DOMAINS,
+)
+from .registry import SyncGroupRegistry, async_get_registry
+from .transition import TransitionRecord
 
 _LOGGER = logging.getLogger(__name__)
 
+# Dispatch tables, indexed by the on/off state string of an entity.
+# Any other state (unavailable, unknown, ...) is not in the tables.
+_STATE_IS_ON: dict[str, bool] = {STATE_ON: True, STATE_OFF: False}
+_STATE_SERVICE: dict[str, str] = {
+    STATE_ON: SERVICE_TURN_ON,
+    STATE_OFF: SERVICE_TURN_OFF,
+}
+
+# errors of a member's service call which are tracked and retried
+_MEMBER_ERRORS = (HomeAssistantError, TimeoutError)
+
 
 class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
     """A Synchronised Group of Switches"""
@@ -46,6 +70,10 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
         unique_id: str,
         name: str,
         entity_ids: list[str],
+        optimistic: bool = False,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+        retry_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
     ) -> None:
         assert (
             len(entity_ids) > 1
@@ -63,16 +91,44 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             entity_ids[1:],
         )
         # internally the first entity is elected master, and the state is synchronised around it.
-        self._master_id = entity_ids[0]
-        self._entity_ids = entity_ids[1:]
+        # Membership is held by the shared registry once the entity is added to hass:
+        # until then (and after removal) the entity-ids are kept here.
+        self._pending_entity_ids: tuple[str, ...] | None = tuple(entity_ids)
+        self._registry: SyncGroupRegistry | None = None
+        self._slot: int = -1
 
         self._attr_name = name
         # self._attr_extra_state_attributes = {ATTR_ENTITY_ID: [master] + entity_ids}
         self._attr_unique_id = unique_id
         self._attr_entity_id = unique_id
 
-        # callable to unsubscribe from event handlers. by default a NOOP.
-        self.__unsubscribe = lambda: None
+        # In optimistic mode the group publishes the target state before the master
+        # reaches it; the master must confirm it within confirm_timeout seconds.
+        self._optimistic = optimistic
+        self._confirm_timeout = confirm_timeout
+        # target state waiting for the master's confirmation, its deadline timer,
+        # and the future the transition waits on before moving the other entities
+        self._pending_on: bool | None = None
+        self._cancel_deadline: CALLBACK_TYPE | None = None
+        self._confirmation: asyncio.Future[None] | None = None
+
+        # The transition in progress: the state the group is moving to, and the
+        # context carried by all its service calls and by its state write.
+        self._target_on: bool | None = None
+        self._transition_context: Context | None = None
+        # is_on and failed entities last written to the state machine,
+        # and writes done in the transition
+        self._written: tuple[bool | None, list[str]] | None = None
+        self._transition_writes: int = 0
+        # record of the transition in progress, kept only for WebSocket subscribers
+        self._transition_record: TransitionRecord | None = None
+
+        # Members failing a command are retried alone, with exponential backoff
+        # from retry_delay seconds, up to retry_attempts times.
+        self._retry_attempts = retry_attempts
+        self._retry_delay = retry_delay
+        self._failed_entities: list[str] = []
+        self._retry_task: asyncio.Task | None = None
 
     @cached_property
     def name(self):
@@ -83,6 +139,28 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
         """The entity-id of the entity object"""
         return self.unique_id
 
+    @property
+    def _master_id(self) -> str:
+        """Entity-id of the master entity of the group"""
+        if self._registry is None:
+            return self._pending_entity_ids[0]
+        return self._registry.master_id(self._slot)
+
+    @property
+    def _entity_ids(self) -> list[str]:
+        """Entity-ids of the non-master entities of the group"""
+        return self._domain_entity_ids(None)
+
+    def _domain_entity_ids(self, domain: str | None) -> list[str]:
+        """Entity-ids of the non-master entities of the group, of one domain if given"""
+        if self._registry is None:
+            return [
+                entity
+                for entity in self._pending_entity_ids[1:]
+                if domain is None or entity.startswith(f"{domain}.")
+            ]
+        return self._registry.entity_ids(self._slot, domain)
+
     async def __async_initialize_state(self):
         """[Internal] Called only once in object lifecycle, when entity is added to HASS
 
@@ -105,29 +183,35 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
     async def async_added_to_hass(self):
         # change the group state to the master's state and udpate the other entities.
         await self.__async_initialize_state()
+        # from now on the registry tracks the members' state, used by async_update()
+        self._async_register()
         await self.async_update()
 
-        unsub_master = async_track_state_change_event(
-            self.hass,
-            entity_ids=self._master_id,
-            action=partial(_master_changed, self),
-        )
-        unsub_entities = async_track_state_change_event(
-            self.hass, entity_ids=self._entity_ids, action=partial(_slave_changed, self)
-        )
-
-        def unsubscribe():
-            _LOGGER.debug("Unsubscribing master and slaves entities events handlers")
-            unsub_master()
-            unsub_entities()
+        _LOGGER.debug("%s added to hass", self.entity_id)
 
-        self.__unsubscribe = unsubscribe
+    @callback
+    def _async_register(self) -> None:
+        """Hand the group membership over to the shared registry
 
-        _LOGGER.debug("%s added to hass", self.entity_id)
+        The registry subscribes to the members' state changes, and dispatches
+        them to _master_changed/_slave_changed.
+        """
+        registry = async_get_registry(self.hass)
+        self._slot = registry.async_add_group(self, self._pending_entity_ids)
+        self._registry = registry
+        self._pending_entity_ids = None
 
     async def async_will_remove_from_hass(self):
         self.hass.states.async_remove(self.entity_id, self._context)
-        self.__unsubscribe()
+        # a transition waiting for confirmation stops, as superseded
+        self._transition_context = None
+        self._async_clear_pending()
+        self._async_cancel_retry()
+        if self._registry is not None:
+            self._pending_entity_ids = (self._master_id, *self._entity_ids)
+            self._registry.async_remove_group(self._slot)
+            self._registry = None
+            self._slot = -1
 
         _LOGGER.debug(
             "%s about to be removed from hass. subscriptions un-registered.",
@@ -143,8 +227,7 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             ", ".join(self._entity_ids),
         )
 
-        await self.async_master_switch(to_state=STATE_ON)
-        await self.async_update()
+        await self._async_transition(STATE_ON)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Forward the turn_of command to all switches in the group."""
@@ -155,14 +238,75 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             ", ".join(self._entity_ids),
         )
 
-        await self.async_master_switch(to_state=STATE_OFF)
-        await self.async_update()
+        await self._async_transition(STATE_OFF)
+
+    async def _async_transition(
+        self, to_state: Literal["on"] | Literal["off"], trigger: str | None = None
+    ) -> None:
+        """Move the master, the group and then all the other entities to the state
+
+        The whole transition runs in one context, child of the context which
+        triggered it (the service call, or the state change of the `trigger` member),
+        and writes the group state once.
+
+        A newer transition supersedes this one: the other entities are then left
+        to the newer transition.
+        """
+        if self._pending_on is not None:
+            # the target waiting for confirmation is superseded: this transition
+            # starts again from the master's state
+            self._async_clear_pending()
+            self._attr_is_on = self._master_is_on(self._attr_is_on)
+
+        parent = self._context
+        context = Context(parent_id=parent.id if parent is not None else None)
+        self.async_set_context(context)
+        self._transition_context = context
+        self._target_on = _STATE_IS_ON[to_state]
+        self._transition_writes = 0
+
+        record = None
+        if self._registry is not None and self._registry.transition_subscribers:
+            record = TransitionRecord(
+                self.hass,
+                self.entity_id,
+                trigger,
+                to_state,
+                [self._master_id, *self._entity_ids],
+            )
+            self._transition_record = record
+            record.async_publish()
+
+        try:
+            await self.async_master_switch(to_state=to_state)
+            if self._transition_context is context:
+                await self.async_update()
+        finally:
+            if record is not None:
+                record.async_publish(done=True)
+                if self._transition_record is record:
+                    self._transition_record = None
+            if self._transition_context is context:
+                _LOGGER.debug(
+                    "group %s transition to %s done with %d state writes",
+                    self.entity_id,
+                    to_state,
+                    self._transition_writes,
+                )
+                self._transition_context = None
+                self._target_on = None
+                # the members failing this transition are known once it ends
+                self._async_write_state()
 
     async def async_master_switch(
         self, to_state: Literal["on"] | Literal["off"]
     ) -> None:
         """Change the master entity to the specified state and update group state.
 
+        In optimistic mode the group state is published before calling the master,
+        and it is rolled back if the master fails or does not confirm it in time:
+        this returns once the master confirmed the state, or it was rolled back.
+
         A call to async_update() is necessary to change the state of all the
         other entities in the group.
         """
@@ -175,26 +319,139 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             to_state,
         )
 
-        if to_state == STATE_ON:
-            service_name = SERVICE_TURN_ON
-        elif to_state == STATE_OFF:
-            service_name = SERVICE_TURN_OFF
-        else:
+        service_name = _STATE_SERVICE.get(to_state)
+        if service_name is None:
             _LOGGER.debug(
                 "Unsupported to update states to %s (%s). Skipping update.",
-                self.state,
-                type(self.state),
+                to_state,
+                type(to_state),
             )
             return
 
-        await self.hass.services.async_call(
-            domain=self._master_id.split(".", 1)[0],
-            service=service_name,
-            service_data={ATTR_ENTITY_ID: [self._master_id]},
-            blocking=True,
+        master_state = self.hass.states.get(self._master_id)
+        if master_state is not None and master_state.state == to_state:
+            # the master is already there (e.g. switched by hand, starting this
+            # transition): nothing to call, nor to confirm. The group follows it.
+            self._attr_is_on = to_state == STATE_ON
+            return
+
+        if not self._optimistic:
+            await self._async_call_service(
+                self._master_id.split(".", 1)[0], service_name, [self._master_id]
+            )
+            self._attr_is_on = to_state == STATE_ON
+            return
+
+        context = self._transition_context
+        self._async_publish_optimistic(to_state == STATE_ON)
+        confirmation = self._confirmation
+        try:
+            await self._async_call_service(
+                self._master_id.split(".", 1)[0], service_name, [self._master_id]
+            )
+        except HomeAssistantError as err:
+            if self._pending_on is not None:
+                self._async_rollback(f"master call failed: {err}")
+            raise
+
+        # the other entities are not moved to a state the master may not reach
+        await confirmation
+        if self._transition_context is not context:
+            return
+
+        # confirmed, or rolled back (possibly while the master call was slower than
+        # the deadline, its change then skipped as part of this transition):
+        # the group follows the master state.
+        self._attr_is_on = self._master_is_on(self._attr_is_on)
+
+    @callback
+    def _async_publish_optimistic(self, is_on: bool) -> None:
+        """Publish the target state now, and wait for the master to confirm it"""
+        self._async_clear_pending()
+        self._pending_on = is_on
+        self._cancel_deadline = async_call_later(
+            self.hass, self._confirm_timeout, self._async_confirm_expired
+        )
+        self._confirmation = self.hass.loop.create_future()
+        self._attr_is_on = is_on
+        self._async_write_state()
+
+    def _master_is_on(self, default: bool | None) -> bool | None:
+        """Whether the master is on, or the default if it is neither on nor off"""
+        master_state = self.hass.states.get(self._master_id)
+        if master_state is None:
+            return default
+        return _STATE_IS_ON.get(master_state.state, default)
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Write the group state, unless it is already written
+
+        Each write is recorded and fires a state_changed event: within a transition
+        the group state is written once, when the state or the failed entities change.
+        """
+        written = (self._attr_is_on, self._failed_entities)
+        if written == self._written:
+            return
+        self._written = written
+        self._transition_writes += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _async_clear_pending(self) -> None:
+        """Forget the target state waiting for confirmation, if any
+
+        The transition waiting for the confirmation resumes.
+        """
+        self._pending_on = None
+        if self._cancel_deadline is not None:
+            self._cancel_deadline()
+            self._cancel_deadline = None
+        if self._confirmation is not None:
+            if not self._confirmation.done():
+                self._confirmation.set_result(None)
+            self._confirmation = None
+
+    @callback
+    def _async_confirm_expired(self, _now) -> None:
+        """The master did not confirm the optimistic state in time"""
+        self._cancel_deadline = None
+        if self._pending_on is not None:
+            self._async_rollback(
+                f"master not confirmed within {self._confirm_timeout} seconds"
+            )
+
+    @callback
+    def _async_rollback(self, reason: str) -> None:
+        """Move the group back to the master's state, and report the failure
+
+        The other entities were left in the previous state, waiting for the
+        confirmation: the transition synchronises them to the master's.
+        """
+        target = STATE_ON if self._pending_on else STATE_OFF
+        self._async_clear_pending()
+        self._attr_is_on = self._master_is_on(not self._attr_is_on)
+
+        _LOGGER.warning(
+            "group %s: %s to %s, rolled back to %s (%s)",
+            self.entity_id,
+            self._master_id,
+            target,
+            self.state,
+            reason,
+        )
+        self.hass.bus.async_fire(
+            EVENT_CONFIRMATION_FAILED,
+            {
+                ATTR_ENTITY_ID: self.entity_id,
+                "master": self._master_id,
+                "target": target,
+                "state": self.state,
+                "reason": reason,
+            },
         )
 
-        self._attr_is_on = to_state == STATE_ON
+        self._async_write_state()
 
     async def async_update(self):
         """Update entities according to group's state.
@@ -211,7 +468,8 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             _LOGGER.error("master %s is in None state", self._master_id)
             return
 
-        if self.state != master_state.state:
+        # an optimistic state is published before the master reaches it
+        if self.state != master_state.state and self._pending_on is None:
             _LOGGER.error(
                 "group %s state and master %s state differ. this should not happen.",
                 self.entity_id,
@@ -224,11 +482,8 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
             self.state,
         )
 
-        if self.state == STATE_ON:
-            service_name = SERVICE_TURN_ON
-        elif self.state == STATE_OFF:
-            service_name = SERVICE_TURN_OFF
-        else:
+        service_name = _STATE_SERVICE.get(self.state)
+        if service_name is None:
             _LOGGER.debug(
                 "Unsupported group's state '%s' (type:%s) for async_update(). Skipping update.",
                 self.state,
@@ -238,129 +493,300 @@ class SyncSwitchGroup(SwitchEntity):  # pylint: disable=abstract-method
 
         # first update HA state, then change state for entities
         # so that any state-changed event triggered won't be propagated any further
-        # i.e. will be stopped processing since it's "same state"
-        self.schedule_update_ha_state()
+        # i.e. will be stopped processing since it's "same state".
+        # The failures of the previous command are cleared in the same write.
+        self._async_set_failed({})
+        self._async_write_state()
+
+        # a new command supersedes the retries of the previous one
+        self._async_cancel_retry()
 
+        failed: dict[str, str] = {}
         for supported_domain in SUPPORTED_DOMAINS:
-            await self.hass.services.async_call(
-                domain=supported_domain,
-                service=service_name,
-                service_data={
-                    ATTR_ENTITY_ID: [
-                        entity
-                        for entity in self._entity_ids
-                        if entity.startswith(f"{supported_domain}.")
-                    ]
-                },
-                blocking=True,
+            entity_ids = self._domain_entity_ids(supported_domain)
+            if entity_ids:
+                failed.update(
+                    await self._async_call_domain(
+                        supported_domain, service_name, entity_ids
+                    )
+                )
+
+        self._async_set_failed(failed)
+        if self._transition_context is None:
+            # otherwise written at the end of the transition
+            self._async_write_state()
+        if not failed:
+            return
+        if self._retry_attempts:
+            self._retry_task = self.hass.async_create_background_task(
+                self._async_retry(service_name, failed, self._transition_context),
+                name=f"{self.entity_id} retry {service_name}",
+            )
+        else:
+            self._log_failed(service_name, failed, 0)
+
+    async def _async_call_domain(
+        self, domain: str, service: str, entity_ids: list[str]
+    ) -> dict[str, str]:
+        """Call a service on the members of one domain, returning the failed ones
+
+        The members are called at once; only if that fails, the members which did not
+        reach the target state, according to the registry, are called one by one,
+        to know which of them failed.
+        """
+        try:
+            await self._async_call_service(domain, service, entity_ids)
+            return {}
+        except _MEMBER_ERRORS as err:
+            if len(entity_ids) == 1:
+                return {entity_ids[0]: str(err)}
+            _LOGGER.debug(
+                "group %s: %s.%s failed (%s), calling members one by one",
+                self.entity_id,
+                domain,
+                service,
+                err,
             )
 
+        if self._registry is None:
+            # not registered yet (updated before being added): no member status
+            return await self._async_call_each(service, entity_ids)
+
+        target = self.state
+        pending = [
+            entity_id
+            for entity_id in entity_ids
+            if not self._registry.member_in_state(entity_id, target)
+        ]
+        return await self._async_call_each(service, pending)
+
+    async def _async_call_each(
+        self, service: str, entity_ids: list[str], context: Context | None = None
+    ) -> dict[str, str]:
+        """Call a service on each member separately, returning the errors by member"""
+        results = await asyncio.gather(
+            *(
+                self._async_call_service(
+                    entity_id.split(".", 1)[0], service, [entity_id], context
+                )
+                for entity_id in entity_ids
+            ),
+            return_exceptions=True,
+        )
 
-@callback
-def _master_changed(
-    group_entity: SyncSwitchGroup, event: Event[EventStateChangedData]
-) -> None:
-    """Update the group's state as consequence of a change of the master entity status"""
-    entity_id = event.data["entity_id"]
-    old_state: State | None = event.data["old_state"]
-    new_state: State = event.data["new_state"]
+        failed: dict[str, str] = {}
+        for entity_id, result in zip(entity_ids, results):
+            if isinstance(result, _MEMBER_ERRORS):
+                failed[entity_id] = str(result)
+            elif isinstance(result, BaseException):
+                raise result
+        return failed
 
-    if old_state is None:
-        # <https://www.home-assistant.io/docs/configuration/events/#state_changed>
-        # state set for the first time
-        # this does not need to trigger a change of state for this object
-        return
+    async def _async_retry(
+        self, service: str, failed: dict[str, str], context: Context | None
+    ) -> None:
+        """Retry the service on the failed members, with exponential backoff and jitter
 
-    if old_state and new_state.state == old_state.state:
-        # no change
-        _LOGGER.debug(
-            "%s, old state and new state are the same: %s. ignore.",
-            entity_id,
-            new_state.state,
+        Retries stop as soon as the group changes state: the new command covers them.
+        The members still failing after the last retry are logged once.
+        """
+        target_on = self._attr_is_on
+        for attempt in range(self._retry_attempts):
+            delay = min(self._retry_delay * 2**attempt, MAX_RETRY_DELAY)
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            if self._attr_is_on is not target_on:
+                return
+
+            entity_ids = list(failed)
+            failed = await self._async_call_each(service, entity_ids, context)
+            self._async_set_failed(failed)
+            self._async_write_state()
+            if not failed:
+                _LOGGER.info(
+                    "group %s: %s succeeded for %s after %d retries",
+                    self.entity_id,
+                    service,
+                    ", ".join(entity_ids),
+                    attempt + 1,
+                )
+                return
+
+        self._log_failed(service, failed, self._retry_attempts)
+
+    def _log_failed(self, service: str, failed: dict[str, str], retries: int) -> None:
+        _LOGGER.warning(
+            "group %s: %s failed for %s after %d retries",
+            self.entity_id,
+            service,
+            ", ".join(f"{entity_id} ({error})" for entity_id, error in failed.items()),
+            retries,
         )
-        return
 
-    if new_state.state == group_entity.state:
-        _LOGGER.debug(
-            "master %s already in %s state. skip update triggered by %s",
-            entity_id,
-            new_state.state,
-            new_state.context.id,
+    @callback
+    def _async_cancel_retry(self) -> None:
+        """Stop retrying the failed members, if retrying"""
+        if self._retry_task is not None:
+            if self._retry_task is not asyncio.current_task():
+                self._retry_task.cancel()
+            self._retry_task = None
+
+    @callback
+    def _async_set_failed(self, failed: dict[str, str]) -> None:
+        """Set the members which failed the last command as group attribute
+
+        The attribute is published with the next state write.
+        """
+        for entity_id, error in failed.items():
+            _LOGGER.debug("group %s: %s failed: %s", self.entity_id, entity_id, error)
+
+        failed_entities = sorted(failed)
+        if failed_entities == self._failed_entities:
+            return
+        self._failed_entities = failed_entities
+        self._attr_extra_state_attributes = (
+            {ATTR_FAILED_ENTITIES: failed_entities} if failed_entities else {}
         )
-        return
-
-    _LOGGER.debug(
-        "master entity %s changed state from=%s to=%s triggered by %s. Updating group state",
-        entity_id,
-        old_state.state if old_state else old_state,
-        new_state.state,
-        new_state.context.id if new_state.context else "uknown-event",
-    )
-
-    async_update_group_state = getattr(group_entity, f"async_turn_{new_state.state}")
-
-    if async_update_group_state is not None:
-        group_entity.hass.create_task(async_update_group_state())
-    else:
-        _LOGGER.fatal(
-            "master %s changed to unrecognised state '%s': it should be on/off only",
-            entity_id,
-            new_state.state,
+
+    async def _async_call_service(
+        self,
+        domain: str,
+        service: str,
+        entity_ids: list[str],
+        context: Context | None = None,
+    ) -> None:
+        """Call a service on member entities of the group, waiting for its completion"""
+        await self.hass.services.async_call(
+            domain=domain,
+            service=service,
+            service_data={ATTR_ENTITY_ID: entity_ids},
+            blocking=True,
+            context=context or self._transition_context,
         )
 
+    @callback
+    def _master_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Update the group's state as consequence of a change of the master entity status
 
-@callback
-def _slave_changed(
-    group_entity: SyncSwitchGroup, event: Event[EventStateChangedData]
-) -> None:
-    """Update the group's state as consequence of a change of the master entity status
+        This runs for every state_changed event of the master: the exits for
+        "no change" and "group already in this state" only read the event and
+        compare interned state strings, and log through _log_skip, which builds
+        no arguments unless debug is enabled.
+        """
+        data = event.data
+        old_state: State | None = data["old_state"]
+        new_state: State | None = data["new_state"]
+
+        if old_state is None or new_state is None:
+            # <https://www.home-assistant.io/docs/configuration/events/#state_changed>
+            # state set for the first time, or entity removed:
+            # this does not need to trigger a change of state for this object
+            return
+
+        state = new_state.state
+        if state == old_state.state:
+            # no change (e.g. attributes only)
+            _log_skip(data["entity_id"], state, "old state and new state are the same")
+            return
 
-    To avoid useless events and loops, skip when there is no change
-    from the old to the new state, or from the current group state to the new state.
+        if self._transition_record is not None:
+            self._transition_record.async_member_changed(data["entity_id"], state)
 
-    Otherwise, update the master state, to trigger the update.
-    The event handler for master will manage the rest of the update flow.
-    """
-    entity_id = event.data["entity_id"]
-    old_state: State | None = event.data["old_state"]
-    new_state: State | None = event.data["new_state"]
+        is_on = _STATE_IS_ON.get(state)
+        if is_on is None:
+            # unavailable/unknown masters do not drive the group: they flap often
+            _log_skip(data["entity_id"], state, "state is not on/off")
+            return
+
+        if is_on is self._attr_is_on:
+            if self._pending_on is not None:
+                # the master confirmed the optimistic group state
+                self._async_clear_pending()
+            _log_skip(data["entity_id"], state, "group already in this state")
+            return
 
-    if old_state is None:
-        # <https://www.home-assistant.io/docs/configuration/events/#state_changed>
-        # state set for the first time
-        # this does not need to trigger a change of state for this object
-        return
+        if is_on is self._target_on:
+            # the master reached the state of the transition in progress,
+            # which will update the group and the other entities.
+            _log_skip(data["entity_id"], state, "group transition in progress")
+            return
 
-    assert new_state.state in [STATE_OFF, STATE_ON], "state should be on/off only"
+        if self._pending_on is not None:
+            # the master moved away from the optimistic group state:
+            # report it, then the group follows the master as usual.
+            self._async_rollback(f"master changed to {state}")
+            return
 
-    if old_state and old_state.state == new_state.state:
-        # no change
         _LOGGER.debug(
-            "%s, old state and new state are the same: %s. ignore.",
-            entity_id,
-            new_state.state,
+            "master entity %s changed state from=%s to=%s triggered by %s. Updating group state",
+            data["entity_id"],
+            old_state.state,
+            state,
+            new_state.context.id,
         )
-        return
 
-    # This check avoid infinite loops and useless events in general:
-    # slave sends event which changes master, which updates slaves
-    # which sends event which changes master...
-    if new_state.state == group_entity.state:
-        # the entity moved to the same state of the group, ignore
+        self.async_set_context(new_state.context)
+        self.hass.async_create_task(self._async_transition(state, data["entity_id"]))
+
+    @callback
+    def _slave_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Update the master's state as consequence of a change of a non-master entity
+
+        To avoid useless events and loops, skip when there is no change
+        from the old to the new state, or from the current group state to the new state.
+
+        Otherwise, turn the group to the new state: the master first, then the
+        other entities, in one transition.
+        """
+        data = event.data
+        old_state: State | None = data["old_state"]
+        new_state: State | None = data["new_state"]
+
+        if old_state is None or new_state is None:
+            # <https://www.home-assistant.io/docs/configuration/events/#state_changed>
+            # state set for the first time, or entity removed:
+            # this does not need to trigger a change of state for this object
+            return
+
+        state = new_state.state
+        if state == old_state.state:
+            # no change (e.g. attributes only)
+            _log_skip(data["entity_id"], state, "old state and new state are the same")
+            return
+
+        if self._transition_record is not None:
+            self._transition_record.async_member_changed(data["entity_id"], state)
+
+        is_on = _STATE_IS_ON.get(state)
+        if is_on is None:
+            # unavailable/unknown entities do not drive the group
+            _log_skip(data["entity_id"], state, "state is not on/off")
+            return
+
+        # This check avoid infinite loops and useless events in general:
+        # slave sends event which changes master, which updates slaves
+        # which sends event which changes master...
+        if is_on is self._attr_is_on or is_on is self._target_on:
+            _log_skip(data["entity_id"], state, "group already in this state")
+            return
+
         _LOGGER.debug(
-            "%s change to state %s, but group is already in this state. ignore",
-            entity_id,
-            new_state.state,
+            "entity %s chaged state from=%s to=%s. triggering group transition.",
+            data["entity_id"],
+            old_state.state,
+            state,
         )
-        return
-
-    _LOGGER.debug(
-        "entity %s chaged state from=%s to=%s. triggering group master entity update.",
-        entity_id,
-        old_state.state if old_state else old_state,
-        new_state.state,
-    )
-    # trigger a change of state for master, triggering master's state change events
-    group_entity.hass.create_task(
-        group_entity.async_master_switch(to_state=new_state.state)
-    )
+        # change master, group and the other entities in one transition:
+        # the master's state change event will then find the group in its state.
+        self.async_set_context(new_state.context)
+        self.hass.async_create_task(self._async_transition(state, data["entity_id"]))
+
+
+def _log_skip(entity_id: str, state: str, reason: str) -> None:
+    """Log a skipped state_changed event, if debug is enabled
+
+    This is the only debug path of the handlers' fast exits: the positional
+    arguments of this call allocate nothing, and the logging call arguments
+    are built only when debug is enabled.
+    """
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("%s changed to %s: %s. ignore.", entity_id, state, reason)
@@ -0,0 +1,71 @@
+"""Records of the group transitions, published to the WebSocket subscribers
+
+A record is kept only while some client is subscribed to the transitions
+(see websocket.py): it follows the members reaching the target state, and is
+published on the dispatcher at start, at each member completion, and at the end.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import SIGNAL_TRANSITION
+
+
+class TransitionRecord:
+    """A group transition, and the latency of each member reaching its target"""
+
+    __slots__ = ("hass", "group", "trigger", "target", "_started", "_latencies")
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        group: str,
+        trigger: str | None,
+        target: str,
+        members: list[str],
+    ) -> None:
+        self.hass = hass
+        self.group = group
+        self.trigger = trigger
+        self.target = target
+        self._started = time.monotonic()
+        # member entity-id -> milliseconds to reach the target, None until then.
+        # Members already in the target state are complete from the start.
+        self._latencies: dict[str, int | None] = {}
+        for entity_id in members:
+            state = hass.states.get(entity_id)
+            self._latencies[entity_id] = (
+                0 if state is not None and state.state == target else None
+            )
+
+    def _elapsed_ms(self) -> int:
+        return int((time.monotonic() - self._started) * 1000)
+
+    @callback
+    def async_member_changed(self, entity_id: str, state: str) -> None:
+        """Complete the member if it reached the target state"""
+        if state != self.target or self._latencies.get(entity_id, 0) is not None:
+            return
+        self._latencies[entity_id] = self._elapsed_ms()
+        self.async_publish()
+
+    @callback
+    def async_publish(self, done: bool = False) -> None:
+        """Send the record to the subscribers"""
+        async_dispatcher_send(self.hass, SIGNAL_TRANSITION, self.as_dict(done))
+
+    def as_dict(self, done: bool = False) -> dict[str, Any]:
+        """Compact representation of the record, as sent to the clients"""
+        return {
+            "group": self.group,
+            "trigger": self.trigger,
+            "target": self.target,
+            "members": dict(self._latencies),
+            "latency": self._elapsed_ms(),
+            "done": done,
+        }
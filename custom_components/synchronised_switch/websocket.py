@@ -0,0 +1,101 @@
+"""WebSocket API of the Synchronised Switch groups"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    ATTR_THROTTLE,
+    DEFAULT_THROTTLE,
+    DOMAIN,
+    MAX_THROTTLE,
+    SIGNAL_TRANSITION,
+)
+from .registry import async_get_registry
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands"""
+    websocket_api.async_register_command(hass, websocket_subscribe_transitions)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_transitions",
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_THROTTLE, default=DEFAULT_THROTTLE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_THROTTLE)
+        ),
+    }
+)
+@callback
+def websocket_subscribe_transitions(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the transition records of the groups, optionally of some groups only
+
+    Messages are sent at most once every `throttle` seconds: records of the same
+    group received in the meantime are coalesced, keeping the latest one.
+    """
+    msg_id = msg["id"]
+    groups = frozenset(msg[ATTR_ENTITY_ID]) if ATTR_ENTITY_ID in msg else None
+    throttle: float = msg[ATTR_THROTTLE]
+
+    # group entity-id -> latest record not sent yet
+    pending: dict[str, dict[str, Any]] = {}
+    last_sent = 0.0
+    cancel_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def flush(_now=None) -> None:
+        nonlocal last_sent, cancel_flush
+        cancel_flush = None
+        last_sent = time.monotonic()
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"transitions": list(pending.values())})
+        )
+        pending.clear()
+
+    @callback
+    def forward_transition(record: dict[str, Any]) -> None:
+        nonlocal cancel_flush
+        if groups is not None and record["group"] not in groups:
+            return
+
+        pending[record["group"]] = record
+        if cancel_flush is not None:
+            return
+
+        wait = last_sent + throttle - time.monotonic()
+        if wait <= 0:
+            flush()
+        else:
+            cancel_flush = async_call_later(hass, wait, flush)
+
+    registry = async_get_registry(hass)
+    unsub_dispatcher = async_dispatcher_connect(
+        hass, SIGNAL_TRANSITION, forward_transition
+    )
+    registry.transition_subscribers += 1
+
+    @callback
+    def unsubscribe() -> None:
+        unsub_dispatcher()
+        registry.transition_subscribers -= 1
+        if cancel_flush is not None:
+            cancel_flush()
+
+    connection.subscriptions[msg_id] = unsubscribe
+    connection.send_result(msg_id)
@@ -0,0 +1,111 @@
+"""Microbenchmark of the state_changed event handlers of a synchronised group.
+
+Measures the cost per event of the master/slave handlers on their exit paths,
+and the memory allocated transiently while handling the event.
+
+Run from the repository root:
+
+    python -m tests.benchmarks.bench_handlers [--events N]
+"""
+
+import argparse
+import logging
+import timeit
+import tracemalloc
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import Event, State
+
+from custom_components.synchronised_switch.synchronised_switch import SyncSwitchGroup
+
+MASTER = "switch.master"
+SLAVE = "light.slave"
+
+
+class _FakeHass:  # pylint: disable=too-few-public-methods
+    """Drop the tasks scheduled by the handlers: only the dispatch is measured."""
+
+    @staticmethod
+    def async_create_task(coro):
+        coro.close()
+
+
+def _event(entity_id: str, old: str, new: str) -> Event:
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": State(entity_id, old),
+            "new_state": State(entity_id, new),
+        },
+    )
+
+
+def _group() -> SyncSwitchGroup:
+    group = SyncSwitchGroup(
+        unique_id="switch.bench", name="bench", entity_ids=[MASTER, SLAVE]
+    )
+    group.hass = _FakeHass()
+    group._attr_is_on = True  # pylint: disable=protected-access
+    return group
+
+
+def _noop(event: Event) -> None:  # pylint: disable=unused-argument
+    """A handler allocating nothing: measures the overhead of the loop and tracing"""
+
+
+def _peak(handler, event, events: int) -> int:
+    """Peak bytes allocated while handling `events` events, beyond the baseline"""
+    tracemalloc.start()
+    handler(event)  # warm-up: lazy caches are not part of the steady state
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for _ in range(events):
+        handler(event)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline
+
+
+def _allocated(handler, event, events: int) -> int:
+    """Peak bytes allocated by the handler, net of the no-op handler's"""
+    return max(0, _peak(handler, event, events) - _peak(_noop, event, events))
+
+
+def main() -> None:
+    """Run the benchmark and print a per-event report"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    group = _group()
+
+    cases = [
+        ("master no change", group._master_changed, _event(MASTER, STATE_ON, STATE_ON)),
+        (
+            "master same as group",
+            group._master_changed,
+            _event(MASTER, STATE_OFF, STATE_ON),
+        ),
+        ("master dispatch", group._master_changed, _event(MASTER, STATE_ON, STATE_OFF)),
+        ("slave no change", group._slave_changed, _event(SLAVE, STATE_ON, STATE_ON)),
+        (
+            "slave same as group",
+            group._slave_changed,
+            _event(SLAVE, STATE_OFF, STATE_ON),
+        ),
+        ("slave dispatch", group._slave_changed, _event(SLAVE, STATE_ON, STATE_OFF)),
+    ]
+
+    print(f"{'case':<24}{'ns/event':>12}{'peak alloc B':>16}")
+    for name, handler, event in cases:
+        seconds = min(
+            timeit.repeat(lambda: handler(event), number=args.events, repeat=5)
+        )
+        allocated = _allocated(handler, event, min(args.events, 10_000))
+        print(f"{name:<24}{seconds / args.events * 1e9:>12.1f}{allocated:>16}")
+
+
+if __name__ == "__main__":
+    main()
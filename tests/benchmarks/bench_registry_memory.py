@@ -0,0 +1,89 @@
+"""Memory benchmark of the synchronised groups registry.
+
+Reports the bytes allocated per group and per member to hold groups of
+synchronised entities, split between the group entity objects and the shared
+registry tables, at increasing numbers of groups.
+
+Run from the repository root:
+
+    python -m tests.benchmarks.bench_registry_memory [--members N]
+"""
+
+import argparse
+import asyncio
+import gc
+import tempfile
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.synchronised_switch.registry import async_get_registry
+from custom_components.synchronised_switch.synchronised_switch import SyncSwitchGroup
+
+GROUP_COUNTS = (10, 100, 1_000, 5_000)
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def _measure(hass: HomeAssistant, groups: int, members: int) -> tuple[int, int]:
+    """Bytes held by the group entities and by the registry for `groups` groups"""
+    entity_ids = [
+        [f"switch.group_{group}_master"]
+        + [f"light.group_{group}_member_{member}" for member in range(members - 1)]
+        for group in range(groups)
+    ]
+
+    tracemalloc.start()
+    baseline = _traced()
+    entities = []
+    for index, ids in enumerate(entity_ids):
+        entity = SyncSwitchGroup(
+            unique_id=f"switch.group_{index}", name=f"group {index}", entity_ids=ids
+        )
+        entity.hass = hass
+        entities.append(entity)
+    constructed = _traced()
+
+    for entity in entities:
+        entity._async_register()  # pylint: disable=protected-access
+    registered = _traced()
+    tracemalloc.stop()
+
+    async_get_registry(hass).async_clear()
+    return constructed - baseline, registered - constructed
+
+
+async def _main(members: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        print(
+            f"{'groups':>8}{'members':>10}{'entities B':>14}{'registry B':>14}"
+            f"{'B/group':>10}{'B/member':>10}"
+        )
+        for groups in GROUP_COUNTS:
+            entities, registry = await _measure(hass, groups, members)
+            total = entities + registry
+            print(
+                f"{groups:>8}{groups * members:>10}{entities:>14}{registry:>14}"
+                f"{total / groups:>10.0f}{total / (groups * members):>10.0f}"
+            )
+
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Run the benchmark and print a report per number of groups"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--members", type=int, default=3, help="entities per group, master included"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.members))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,108 @@
 """Fixtures for testing."""
 
+from collections.abc import Awaitable, Callable
+from typing import Any
+
 import pytest
+from homeassistant import core, setup
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.synchronised_switch.const import DOMAIN, SUPPORTED_DOMAINS
+from custom_components.synchronised_switch.synchronised_switch import SyncSwitchGroup
+
+GROUP_ENTITY_ID = "switch.group"
 
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations."""
     return
+
+
+class MockMembers:
+    """turn_on/turn_off services of the group members, recording the calls
+
+    The entities called switch state, unless they are set to fail or to ignore
+    the calls.
+    """
+
+    def __init__(self, hass: core.HomeAssistant) -> None:
+        self.hass = hass
+        self.calls: list[core.ServiceCall] = []
+        # entity-id -> number of the next calls failing
+        self.failing: dict[str, int] = {}
+        # entities accepting the calls without changing state
+        self.unresponsive: set[str] = set()
+        self.async_register()
+
+    def async_register(self) -> None:
+        """Register (again) the services of all the supported domains"""
+        for domain in SUPPORTED_DOMAINS:
+            for service in (SERVICE_TURN_ON, SERVICE_TURN_OFF):
+                self.hass.services.async_register(domain, service, self._async_handle)
+
+    def called(self, entity_id: str) -> list[core.ServiceCall]:
+        """The calls which included the entity"""
+        return [call for call in self.calls if entity_id in call.data[ATTR_ENTITY_ID]]
+
+    async def _async_handle(self, call: core.ServiceCall) -> None:
+        self.calls.append(call)
+        state = STATE_ON if call.service == SERVICE_TURN_ON else STATE_OFF
+        failed = []
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            if self.failing.get(entity_id, 0) > 0:
+                self.failing[entity_id] -= 1
+                failed.append(entity_id)
+            elif entity_id not in self.unresponsive:
+                self.hass.states.async_set(entity_id, state, context=call.context)
+        if failed:
+            raise HomeAssistantError(f"{', '.join(failed)} not responding")
+
+
+@pytest.fixture
+def setup_group(
+    hass: core.HomeAssistant,
+) -> Callable[..., Awaitable[tuple[SyncSwitchGroup, MockMembers]]]:
+    """Set up a group named 'group' of entities all off, with the given options
+
+    The members' services are MockMembers' from the start; the switch services
+    registered by the switch component are replaced again once the group is added,
+    so the tests call the group methods. The calls of the setup are forgotten.
+    """
+
+    async def _setup(
+        entity_ids: list[str], **options: Any
+    ) -> tuple[SyncSwitchGroup, MockMembers]:
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, STATE_OFF)
+        members = MockMembers(hass)
+
+        assert await setup.async_setup_component(
+            hass,
+            SWITCH_DOMAIN,
+            {
+                SWITCH_DOMAIN: {
+                    "platform": DOMAIN,
+                    "name": "group",
+                    "entities": entity_ids,
+                    **options,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+        group = hass.data[SWITCH_DOMAIN].get_entity(GROUP_ENTITY_ID)
+        assert group is not None
+        members.async_register()
+        members.calls.clear()
+        return group, members
+
+    return _setup
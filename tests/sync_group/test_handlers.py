@@ -0,0 +1,95 @@
+"""Test the state_changed handlers of the group."""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+from homeassistant import core
+from homeassistant.const import (
+    EVENT_STATE_CHANGED,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+
+from custom_components.synchronised_switch.synchronised_switch import SyncSwitchGroup
+
+MASTER = "switch.master"
+SLAVE = "light.slave"
+
+
+def _event(entity_id: str, old: str | None, new: str | None) -> core.Event:
+    return core.Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": core.State(entity_id, old) if old is not None else None,
+            "new_state": core.State(entity_id, new) if new is not None else None,
+        },
+    )
+
+
+@pytest.fixture
+def group(hass: core.HomeAssistant) -> SyncSwitchGroup:
+    """A group in the off state, not added to hass"""
+    group = SyncSwitchGroup(
+        unique_id="switch.group", name="group", entity_ids=[MASTER, SLAVE]
+    )
+    group.hass = hass
+    group._attr_is_on = False
+    return group
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        (STATE_OFF, STATE_UNAVAILABLE),
+        (STATE_ON, STATE_UNKNOWN),
+        (None, STATE_ON),
+        (STATE_OFF, None),
+        (STATE_ON, STATE_ON),
+        (STATE_ON, STATE_OFF),
+    ],
+)
+async def test_slave_changes_skipped(
+    hass: core.HomeAssistant, group: SyncSwitchGroup, old, new
+) -> None:
+    """Non on/off states, no change and the group's own state start nothing"""
+    with patch.object(hass, "async_create_task") as create_task:
+        group._slave_changed(_event(SLAVE, old, new))
+
+    create_task.assert_not_called()
+
+
+async def test_master_unrecognised_state_skipped(
+    hass: core.HomeAssistant, group: SyncSwitchGroup, caplog: pytest.LogCaptureFixture
+) -> None:
+    """The master going unavailable does not change the group, nor fill the log"""
+    with patch.object(hass, "async_create_task") as create_task:
+        group._master_changed(_event(MASTER, STATE_OFF, STATE_UNAVAILABLE))
+        group._master_changed(_event(MASTER, STATE_UNAVAILABLE, STATE_OFF))
+
+    create_task.assert_not_called()
+    assert group.is_on is False
+    assert not [
+        record for record in caplog.records if record.levelno >= logging.WARNING
+    ]
+
+
+@pytest.mark.parametrize(
+    ("handler", "entity_id"),
+    [("_master_changed", MASTER), ("_slave_changed", SLAVE)],
+)
+async def test_change_starts_transition(
+    hass: core.HomeAssistant, group: SyncSwitchGroup, handler, entity_id
+) -> None:
+    """A member moving away from the group state starts one transition"""
+    with patch.object(hass, "async_create_task") as create_task:
+        getattr(group, handler)(_event(entity_id, STATE_OFF, STATE_ON))
+
+    create_task.assert_called_once()
+    transition = create_task.call_args.args[0]
+    assert transition.cr_code.co_name == "_async_transition"
+    assert transition.cr_frame.f_locals["trigger"] == entity_id
+    transition.close()
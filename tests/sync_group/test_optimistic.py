@@ -0,0 +1,170 @@
+"""Test the optimistic mode of the group."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant import core
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.synchronised_switch.const import EVENT_CONFIRMATION_FAILED
+
+GROUP_ENTITY_ID = "switch.group"
+MASTER = "switch.master"
+OTHER = "light.other"
+
+
+def _fire_deadline(hass: core.HomeAssistant) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+
+
+async def test_state_published_then_confirmed(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """The group state is published before the master moves, the others follow it"""
+    group, members = await setup_group([MASTER, OTHER], optimistic=True)
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+    members.unresponsive.add(MASTER)
+
+    turn_on = hass.async_create_task(group.async_turn_on())
+    await asyncio.sleep(0)
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+    assert hass.states.get(MASTER).state == STATE_OFF
+    # held until the master confirms
+    assert members.called(OTHER) == []
+
+    hass.states.async_set(MASTER, STATE_ON)
+    await turn_on
+    _fire_deadline(hass)
+    await hass.async_block_till_done()
+
+    assert failures == []
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+    assert hass.states.get(OTHER).state == STATE_ON
+
+
+async def test_rollback_when_deadline_expires(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """An unconfirmed state is rolled back to the master's, and reported"""
+    group, members = await setup_group(
+        [MASTER, OTHER], optimistic=True, confirm_timeout=5
+    )
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    members.unresponsive.add(MASTER)
+
+    turn_on = hass.async_create_task(group.async_turn_on())
+    await asyncio.sleep(0)
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+
+    _fire_deadline(hass)
+    await turn_on
+    await hass.async_block_till_done()
+
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_OFF
+    assert hass.states.get(OTHER).state == STATE_OFF
+    # the other entity never switched on and back off
+    assert [event for event in events if event.data["entity_id"] == OTHER] == []
+    assert len(failures) == 1
+    assert failures[0].data["entity_id"] == GROUP_ENTITY_ID
+    assert failures[0].data["master"] == MASTER
+    assert failures[0].data["target"] == STATE_ON
+    assert failures[0].data["state"] == STATE_OFF
+    assert "not confirmed" in failures[0].data["reason"]
+
+
+async def test_rollback_when_master_call_fails(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """A failing master call rolls the group back at once, and raises"""
+    group, members = await setup_group([MASTER, OTHER], optimistic=True)
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+    members.failing[MASTER] = 1
+
+    with pytest.raises(HomeAssistantError):
+        await group.async_turn_on()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_OFF
+    assert members.called(OTHER) == []
+    assert len(failures) == 1
+    assert "master call failed" in failures[0].data["reason"]
+
+    _fire_deadline(hass)
+    await hass.async_block_till_done()
+    assert len(failures) == 1
+
+
+async def test_master_switched_by_hand(hass: core.HomeAssistant, setup_group) -> None:
+    """The group follows the master without calling it, nor waiting confirmation"""
+    _, members = await setup_group([MASTER, OTHER], optimistic=True)
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+
+    hass.states.async_set(MASTER, STATE_ON)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+    assert hass.states.get(OTHER).state == STATE_ON
+    assert members.called(MASTER) == []
+
+    _fire_deadline(hass)
+    await hass.async_block_till_done()
+    assert failures == []
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+
+
+async def test_pending_state_superseded(hass: core.HomeAssistant, setup_group) -> None:
+    """A newer command cancels the confirmation of the previous one"""
+    group, members = await setup_group([MASTER, OTHER], optimistic=True)
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+    members.unresponsive.add(MASTER)
+
+    turn_on = hass.async_create_task(group.async_turn_on())
+    await asyncio.sleep(0)
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+
+    await group.async_turn_off()
+    await turn_on
+    _fire_deadline(hass)
+    await hass.async_block_till_done()
+
+    assert failures == []
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_OFF
+    assert hass.states.get(OTHER).state == STATE_OFF
+    assert [call.service for call in members.called(OTHER)] == ["turn_off"]
+
+
+async def test_slow_master_applied_after_rollback(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """A master call returning after the deadline still brings the group along"""
+    group, _ = await setup_group([MASTER, OTHER], optimistic=True)
+    failures = async_capture_events(hass, EVENT_CONFIRMATION_FAILED)
+    release = asyncio.Event()
+
+    async def slow_turn_on(call: core.ServiceCall) -> None:
+        await release.wait()
+        hass.states.async_set(MASTER, STATE_ON, context=call.context)
+
+    hass.services.async_register("switch", "turn_on", slow_turn_on)
+
+    turn_on = hass.async_create_task(group.async_turn_on())
+    await asyncio.sleep(0)
+    _fire_deadline(hass)
+    assert len(failures) == 1
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_OFF
+
+    release.set()
+    await turn_on
+    await hass.async_block_till_done()
+
+    assert hass.states.get(MASTER).state == STATE_ON
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_ON
+    assert hass.states.get(OTHER).state == STATE_ON
@@ -0,0 +1,157 @@
+"""Test the profiling of the synchronisation hot path."""
+
+import asyncio
+import cProfile
+from unittest.mock import patch
+
+import pytest
+from homeassistant import core, setup
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.synchronised_switch.const import DOMAIN, SERVICE_PROFILE
+from custom_components.synchronised_switch.profiler import (
+    METRIC_HANDLER,
+    METRIC_SERVICE_CALL,
+    METRIC_UPDATE,
+    RESERVOIR_SIZE,
+    DurationSamples,
+    SyncProfiler,
+    summarise,
+)
+from custom_components.synchronised_switch.registry import async_get_registry
+
+
+class FakeGroup:
+    """Stands in for a group entity, with the methods the profiler times"""
+
+    entity_id = "switch.fake_group"
+
+    def __init__(self, entity_id: str | None = None) -> None:
+        if entity_id is not None:
+            self.entity_id = entity_id
+
+    def _master_changed(self, event):
+        pass
+
+    def _slave_changed(self, event):
+        pass
+
+    async def _async_call_service(self, domain, service, entity_ids):
+        pass
+
+    async def async_update(self):
+        await self._async_call_service("switch", "turn_on", ["switch.other"])
+
+
+def _samples(*durations: float) -> DurationSamples:
+    samples = DurationSamples()
+    for duration in durations:
+        samples.add(duration)
+    return samples
+
+
+def test_summarise() -> None:
+    """The summary reports count and distribution in milliseconds"""
+    assert summarise(DurationSamples()) == {"count": 0}
+    assert summarise(_samples(0.002, 0.001, 0.003)) == {
+        "count": 3,
+        "total_ms": 6.0,
+        "mean_ms": 2.0,
+        "p95_ms": 3.0,
+        "max_ms": 3.0,
+    }
+
+
+def test_samples_are_bounded() -> None:
+    """Count, total and max are exact while the kept durations are bounded"""
+    samples = _samples(*(0.001,) * (RESERVOIR_SIZE * 3), 0.5)
+
+    assert len(samples.reservoir) == RESERVOIR_SIZE
+    summary = summarise(samples)
+    assert summary["count"] == RESERVOIR_SIZE * 3 + 1
+    assert summary["max_ms"] == 500.0
+    assert summary["total_ms"] == pytest.approx(RESERVOIR_SIZE * 3 + 500)
+
+
+async def test_profile_window(hass: core.HomeAssistant) -> None:
+    """Methods are timed only while the window is open"""
+    group = FakeGroup()
+    profiler = SyncProfiler(hass, [group], duration=0.05)
+
+    task = hass.async_create_task(profiler.async_run())
+    await asyncio.sleep(0)
+    group._master_changed(None)
+    group._slave_changed(None)
+    await group.async_update()
+    summary = await task
+
+    metrics = summary["groups"][FakeGroup.entity_id]
+    assert metrics[METRIC_HANDLER]["count"] == 2
+    assert metrics[METRIC_UPDATE]["count"] == 1
+    assert metrics[METRIC_SERVICE_CALL]["count"] == 1
+    assert not group.__dict__
+
+
+async def test_wrappers_removed_when_profile_fails(hass: core.HomeAssistant) -> None:
+    """A profile failing to start does not leave the methods wrapped"""
+    group = FakeGroup()
+    profiler = SyncProfiler(hass, [group], duration=0.05, pstats_path="unused")
+
+    with (
+        patch.object(
+            cProfile.Profile, "enable", side_effect=ValueError("profiler active")
+        ),
+        pytest.raises(ValueError),
+    ):
+        await profiler.async_run()
+
+    assert not group.__dict__
+
+
+async def _setup_groups(hass: core.HomeAssistant, *entity_ids: str) -> None:
+    assert await setup.async_setup_component(hass, DOMAIN, {})
+    registry = async_get_registry(hass)
+    for entity_id in entity_ids:
+        registry.async_add_group(FakeGroup(entity_id), [f"{entity_id}_master"])
+
+
+async def _profile(hass: core.HomeAssistant, **data) -> dict:
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {"duration": 0.1, **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_service_profiles_selected_groups(hass: core.HomeAssistant) -> None:
+    """Only the groups given are profiled, all of them when none is given"""
+    await _setup_groups(hass, "switch.one", "switch.two")
+
+    summary = await _profile(hass, entity_id="switch.two")
+    assert list(summary["groups"]) == ["switch.two"]
+
+    summary = await _profile(hass)
+    assert sorted(summary["groups"]) == ["switch.one", "switch.two"]
+
+
+async def test_service_without_groups(hass: core.HomeAssistant) -> None:
+    """Profiling fails when no group matches"""
+    await _setup_groups(hass, "switch.one")
+
+    with pytest.raises(HomeAssistantError, match="no synchronised groups"):
+        await _profile(hass, entity_id="switch.other")
+
+
+async def test_service_one_profile_at_a_time(hass: core.HomeAssistant) -> None:
+    """A profile cannot start while another one is running"""
+    await _setup_groups(hass, "switch.one")
+
+    first = hass.async_create_task(_profile(hass))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(HomeAssistantError, match="is running"):
+        await _profile(hass)
+
+    assert "switch.one" in (await first)["groups"]
@@ -0,0 +1,113 @@
+"""Test the registry shared by the synchronised groups."""
+
+from homeassistant import core
+
+from custom_components.synchronised_switch.const import DOMAIN
+from custom_components.synchronised_switch.registry import (
+    STATUS_OFF,
+    STATUS_ON,
+    STATUS_UNKNOWN,
+    async_get_registry,
+)
+
+
+class RecordingGroup:
+    """Stands in for a group entity, recording the events dispatched to it"""
+
+    def __init__(self):
+        self.master_events = []
+        self.slave_events = []
+
+    def _master_changed(self, event):
+        self.master_events.append(event.data["entity_id"])
+
+    def _slave_changed(self, event):
+        self.slave_events.append(event.data["entity_id"])
+
+
+async def test_registry_is_created_once_per_hass(hass: core.HomeAssistant) -> None:
+    """The registry is stored in hass.data and reused"""
+    registry = async_get_registry(hass)
+    assert hass.data[DOMAIN] is registry
+    assert async_get_registry(hass) is registry
+
+
+async def test_members_are_interned_across_groups(hass: core.HomeAssistant) -> None:
+    """An entity in two groups is held once, and listed in both groups"""
+    registry = async_get_registry(hass)
+    first = registry.async_add_group(
+        RecordingGroup(), ["switch.master", "light.shared", "switch.other"]
+    )
+    second = registry.async_add_group(
+        RecordingGroup(), ["switch.second_master", "light.shared"]
+    )
+
+    assert len(registry) == 2
+    assert registry.member_count == 4
+    assert registry.master_id(first) == "switch.master"
+    assert registry.entity_ids(first) == ["light.shared", "switch.other"]
+    assert registry.entity_ids(first, "light") == ["light.shared"]
+    assert registry.entity_ids(second) == ["light.shared"]
+
+
+async def test_events_are_dispatched_by_role(hass: core.HomeAssistant) -> None:
+    """Each group receives its members' events, as master or slave"""
+    registry = async_get_registry(hass)
+    first, second = RecordingGroup(), RecordingGroup()
+    registry.async_add_group(first, ["switch.master", "light.shared"])
+    registry.async_add_group(second, ["light.shared", "switch.other"])
+
+    hass.states.async_set("light.shared", "on")
+    hass.states.async_set("switch.master", "off")
+    await hass.async_block_till_done()
+
+    assert first.master_events == ["switch.master"]
+    assert first.slave_events == ["light.shared"]
+    assert second.master_events == ["light.shared"]
+    assert second.slave_events == []
+    assert registry.member_status("light.shared") == STATUS_ON
+    assert registry.member_status("switch.master") == STATUS_OFF
+    assert registry.member_status("switch.other") == STATUS_UNKNOWN
+
+
+async def test_removing_last_group_clears_registry(hass: core.HomeAssistant) -> None:
+    """Removed groups stop receiving events, and the last removal releases all"""
+    registry = async_get_registry(hass)
+    first, second = RecordingGroup(), RecordingGroup()
+    first_slot = registry.async_add_group(first, ["switch.master", "light.shared"])
+    second_slot = registry.async_add_group(second, ["switch.other", "light.shared"])
+
+    registry.async_remove_group(first_slot)
+    hass.states.async_set("light.shared", "on")
+    await hass.async_block_till_done()
+    assert first.slave_events == []
+    assert second.slave_events == ["light.shared"]
+    # the master of the removed group belongs to no group anymore
+    assert registry.member_count == 2
+    assert registry.member_status("switch.master") == STATUS_UNKNOWN
+
+    registry.async_remove_group(second_slot)
+    assert len(registry) == 0
+    assert registry.member_count == 0
+
+    hass.states.async_set("light.shared", "off")
+    await hass.async_block_till_done()
+    assert second.slave_events == ["light.shared"]
+
+
+async def test_dropped_member_index_is_reused(hass: core.HomeAssistant) -> None:
+    """A new member takes the index of a dropped one, with its current status"""
+    registry = async_get_registry(hass)
+    kept = registry.async_add_group(RecordingGroup(), ["switch.kept", "light.kept"])
+    removed = registry.async_add_group(RecordingGroup(), ["switch.gone", "light.gone"])
+    registry.async_remove_group(removed)
+
+    hass.states.async_set("switch.new", "on")
+    new = registry.async_add_group(RecordingGroup(), ["switch.new", "light.kept"])
+
+    assert new == removed
+    assert registry.member_count == 3
+    assert registry.master_id(new) == "switch.new"
+    assert registry.entity_ids(kept) == ["light.kept"]
+    assert registry.member_in_state("switch.new", "on")
+    assert not registry.member_in_state("light.kept", "on")
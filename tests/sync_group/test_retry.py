@@ -0,0 +1,165 @@
+"""Test the tracking and the retries of the members failing a group command."""
+
+import asyncio
+import logging
+from unittest.mock import patch
+
+import pytest
+from homeassistant import core
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.synchronised_switch.const import ATTR_FAILED_ENTITIES
+from custom_components.synchronised_switch.synchronised_switch import SyncSwitchGroup
+
+GROUP_ENTITY_ID = "switch.group"
+MASTER = "switch.master"
+OK = "switch.ok"
+FLAKY = "switch.flaky"
+LIGHT = "light.other"
+
+
+def _failed_entities(hass: core.HomeAssistant) -> list[str] | None:
+    return hass.states.get(GROUP_ENTITY_ID).attributes.get(ATTR_FAILED_ENTITIES)
+
+
+def _warnings(caplog: pytest.LogCaptureFixture) -> list[logging.LogRecord]:
+    return [
+        record
+        for record in caplog.records
+        if record.levelno >= logging.WARNING
+        and record.name.startswith("custom_components.synchronised_switch")
+    ]
+
+
+async def test_only_failed_members_are_tracked(hass: core.HomeAssistant) -> None:
+    """After a failed batch, members already switched are not called again"""
+    calls: list[list[str]] = []
+
+    async def turn_on(call: core.ServiceCall) -> None:
+        calls.append(call.data[ATTR_ENTITY_ID])
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            if entity_id != FLAKY:
+                hass.states.async_set(entity_id, STATE_ON)
+        if FLAKY in call.data[ATTR_ENTITY_ID]:
+            raise HomeAssistantError("device not responding")
+
+    hass.services.async_register("switch", "turn_on", turn_on)
+    for entity_id in ("switch.master", "switch.ok", FLAKY):
+        hass.states.async_set(entity_id, STATE_OFF)
+
+    group = SyncSwitchGroup(
+        unique_id="switch.group",
+        name="group",
+        entity_ids=["switch.master", "switch.ok", FLAKY],
+    )
+    group.hass = hass
+    group._attr_is_on = True
+    group._async_register()
+
+    failed = await group._async_call_domain("switch", "turn_on", ["switch.ok", FLAKY])
+
+    assert failed == {FLAKY: "device not responding"}
+    assert calls == [["switch.ok", FLAKY], [FLAKY]]
+    assert hass.states.get("switch.ok").state == STATE_ON
+
+
+async def test_failed_members_tracked_before_registration(
+    hass: core.HomeAssistant,
+) -> None:
+    """Updated before being added, a group calls every member one by one"""
+    calls: list[list[str]] = []
+
+    async def turn_on(call: core.ServiceCall) -> None:
+        calls.append(call.data[ATTR_ENTITY_ID])
+        if FLAKY in call.data[ATTR_ENTITY_ID]:
+            raise HomeAssistantError("device not responding")
+
+    hass.services.async_register("switch", "turn_on", turn_on)
+
+    group = SyncSwitchGroup(
+        unique_id="switch.group",
+        name="group",
+        entity_ids=["switch.master", "switch.ok", FLAKY],
+    )
+    group.hass = hass
+    group._attr_is_on = True
+
+    failed = await group._async_call_domain("switch", "turn_on", ["switch.ok", FLAKY])
+
+    assert failed == {FLAKY: "device not responding"}
+    assert calls == [["switch.ok", FLAKY], ["switch.ok"], [FLAKY]]
+
+
+async def test_other_domains_synchronised_when_a_member_fails(
+    hass: core.HomeAssistant, setup_group, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A failing switch does not stop the lights, and is reported once"""
+    group, members = await setup_group([MASTER, FLAKY, LIGHT], retry_attempts=0)
+    members.failing[FLAKY] = 1
+
+    await group.async_turn_on()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(LIGHT).state == STATE_ON
+    assert hass.states.get(FLAKY).state == STATE_OFF
+    assert _failed_entities(hass) == [FLAKY]
+    warnings = _warnings(caplog)
+    assert len(warnings) == 1
+    assert FLAKY in warnings[0].getMessage()
+
+
+async def test_failed_members_retried_until_recovered(
+    hass: core.HomeAssistant, setup_group, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Only the failed members are retried; the attribute clears once they recover"""
+    group, members = await setup_group([MASTER, OK, FLAKY, LIGHT], retry_delay=0.1)
+    # fails the batch call and the call of the member alone
+    members.failing[FLAKY] = 2
+
+    with patch(
+        "custom_components.synchronised_switch.synchronised_switch.random.uniform",
+        return_value=0,
+    ):
+        await group.async_turn_on()
+        assert _failed_entities(hass) == [FLAKY]
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get(FLAKY).state == STATE_ON
+    assert _failed_entities(hass) is None
+    assert len(members.called(OK)) == 1
+    assert len(members.called(FLAKY)) == 3
+    assert len(members.called(LIGHT)) == 1
+    assert _warnings(caplog) == []
+
+
+async def test_retries_stop_when_group_changes(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """A new command supersedes the retries of the previous one"""
+    group, members = await setup_group([MASTER, FLAKY], retry_delay=0.1)
+    members.failing[FLAKY] = 100
+
+    def turn_on_calls() -> int:
+        return sum(
+            1 for call in members.called(FLAKY) if call.service == SERVICE_TURN_ON
+        )
+
+    with patch(
+        "custom_components.synchronised_switch.synchronised_switch.random.uniform",
+        return_value=0.05,
+    ):
+        await group.async_turn_on()
+        assert turn_on_calls() == 1
+
+        await group.async_turn_off()
+        await asyncio.sleep(0.3)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert turn_on_calls() == 1
+    assert _failed_entities(hass) == [FLAKY]
@@ -0,0 +1,86 @@
+"""Test the state writes and the contexts of the group transitions."""
+
+from homeassistant import core
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.synchronised_switch.const import ATTR_FAILED_ENTITIES
+
+GROUP_ENTITY_ID = "switch.group"
+MASTER = "switch.master"
+SWITCH = "switch.other"
+LIGHT = "light.other"
+
+
+async def test_one_state_write_per_toggle(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """The group state is written once per transition, however it starts"""
+    group, _ = await setup_group([MASTER, SWITCH, LIGHT])
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    def group_writes() -> int:
+        return sum(1 for event in events if event.data["entity_id"] == GROUP_ENTITY_ID)
+
+    await group.async_turn_on()
+    await hass.async_block_till_done()
+    assert group_writes() == 1
+    assert group._transition_writes == 1
+    assert hass.states.get(LIGHT).state == STATE_ON
+
+    # started by a member
+    hass.states.async_set(SWITCH, STATE_OFF)
+    await hass.async_block_till_done()
+    assert group_writes() == 2
+    assert hass.states.get(GROUP_ENTITY_ID).state == STATE_OFF
+    assert hass.states.get(MASTER).state == STATE_OFF
+    assert hass.states.get(LIGHT).state == STATE_OFF
+
+
+async def test_transition_shares_one_context(
+    hass: core.HomeAssistant, setup_group
+) -> None:
+    """All the member calls of a transition run in one child of the caller's context"""
+    group, members = await setup_group([MASTER, SWITCH, LIGHT])
+    caller = core.Context()
+
+    group.async_set_context(caller)
+    await group.async_turn_on()
+    await hass.async_block_till_done()
+
+    assert len(members.calls) == 3
+    # Context is not hashable: compare the ids
+    assert len({call.context.id for call in members.calls}) == 1
+    context = members.calls[0].context
+    assert context.parent_id == caller.id
+    assert hass.states.get(GROUP_ENTITY_ID).context.id == context.id
+
+
+async def test_failures_written_once(hass: core.HomeAssistant, setup_group) -> None:
+    """Failures are written once the transition ends, and cleared with the state"""
+    group, members = await setup_group([MASTER, SWITCH, LIGHT], retry_attempts=0)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    def group_states() -> list[core.State]:
+        return [
+            event.data["new_state"]
+            for event in events
+            if event.data["entity_id"] == GROUP_ENTITY_ID
+        ]
+
+    members.failing[SWITCH] = 1
+    await group.async_turn_on()
+    await hass.async_block_till_done()
+
+    states = group_states()
+    assert [state.state for state in states] == [STATE_ON, STATE_ON]
+    assert ATTR_FAILED_ENTITIES not in states[0].attributes
+    assert states[1].attributes[ATTR_FAILED_ENTITIES] == [SWITCH]
+
+    events.clear()
+    await group.async_turn_off()
+    await hass.async_block_till_done()
+
+    states = group_states()
+    assert [state.state for state in states] == [STATE_OFF]
+    assert ATTR_FAILED_ENTITIES not in states[0].attributes
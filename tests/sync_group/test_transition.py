@@ -0,0 +1,69 @@
+"""Test the records of the group transitions."""
+
+from typing import Any
+
+from homeassistant import core
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.synchronised_switch.const import SIGNAL_TRANSITION
+from custom_components.synchronised_switch.registry import async_get_registry
+from custom_components.synchronised_switch.transition import TransitionRecord
+
+MASTER = "switch.master"
+MEMBER = "light.member"
+
+
+def _capture(hass: core.HomeAssistant) -> list[dict[str, Any]]:
+    published: list[dict[str, Any]] = []
+
+    @core.callback
+    def _published(record: dict[str, Any]) -> None:
+        published.append(record)
+
+    async_dispatcher_connect(hass, SIGNAL_TRANSITION, _published)
+    return published
+
+
+async def test_member_latencies(hass: core.HomeAssistant) -> None:
+    """Members complete once, on reaching the target; the done record closes it"""
+    hass.states.async_set(MASTER, STATE_OFF)
+    hass.states.async_set(MEMBER, STATE_ON)
+    published = _capture(hass)
+
+    record = TransitionRecord(hass, "switch.group", MEMBER, STATE_ON, [MASTER, MEMBER])
+    assert record.as_dict()["members"] == {MASTER: None, MEMBER: 0}
+
+    # not the target, not a member
+    record.async_member_changed(MASTER, STATE_OFF)
+    record.async_member_changed("switch.stranger", STATE_ON)
+    assert published == []
+
+    record.async_member_changed(MASTER, STATE_ON)
+    record.async_member_changed(MASTER, STATE_ON)
+    assert len(published) == 1
+    assert published[0]["members"][MASTER] >= 0
+    assert published[0]["members"][MEMBER] == 0
+    assert published[0]["done"] is False
+
+    record.async_publish(done=True)
+    assert published[-1]["group"] == "switch.group"
+    assert published[-1]["trigger"] == MEMBER
+    assert published[-1]["target"] == STATE_ON
+    assert published[-1]["done"] is True
+
+
+async def test_group_transition_recorded(hass: core.HomeAssistant, setup_group) -> None:
+    """While some client follows them, the transitions are published start to end"""
+    group, _ = await setup_group([MASTER, MEMBER])
+    published = _capture(hass)
+    async_get_registry(hass).transition_subscribers = 1
+
+    await group.async_turn_on()
+    await hass.async_block_till_done()
+
+    assert published[0]["done"] is False
+    assert published[0]["trigger"] is None
+    assert published[0]["members"] == {MASTER: None, MEMBER: None}
+    assert published[-1]["done"] is True
+    assert None not in published[-1]["members"].values()
@@ -0,0 +1,82 @@
+"""Test the WebSocket subscription to the group transitions."""
+
+from datetime import timedelta
+
+from homeassistant import core, setup
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.synchronised_switch.const import DOMAIN, SIGNAL_TRANSITION
+from custom_components.synchronised_switch.registry import async_get_registry
+
+
+def _record(group: str, done: bool) -> dict:
+    return {
+        "group": group,
+        "trigger": "light.member",
+        "target": "on",
+        "members": {"switch.master": 10, "light.member": 0},
+        "latency": 12,
+        "done": done,
+    }
+
+
+async def test_subscribe_transitions_filters_groups(
+    hass: core.HomeAssistant, hass_ws_client
+) -> None:
+    """Only the records of the requested groups are streamed"""
+    assert await setup.async_setup_component(hass, DOMAIN, {})
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {
+            "type": f"{DOMAIN}/subscribe_transitions",
+            "entity_id": ["switch.followed"],
+            "throttle": 0,
+        }
+    )
+    result = await client.receive_json()
+    assert result["success"]
+    assert async_get_registry(hass).transition_subscribers == 1
+
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.ignored", True))
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.followed", True))
+
+    message = await client.receive_json()
+    assert message["event"] == {"transitions": [_record("switch.followed", True)]}
+
+    await client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": result["id"]}
+    )
+    assert (await client.receive_json())["success"]
+    assert async_get_registry(hass).transition_subscribers == 0
+
+
+async def test_subscribe_transitions_throttled(
+    hass: core.HomeAssistant, hass_ws_client
+) -> None:
+    """Records received within the throttle are coalesced per group, the latest kept"""
+    assert await setup.async_setup_component(hass, DOMAIN, {})
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe_transitions", "throttle": 10}
+    )
+    assert (await client.receive_json())["success"]
+
+    # the first record is sent at once
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.one", False))
+    message = await client.receive_json()
+    assert message["event"] == {"transitions": [_record("switch.one", False)]}
+
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.one", False))
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.two", False))
+    async_dispatcher_send(hass, SIGNAL_TRANSITION, _record("switch.one", True))
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    message = await client.receive_json()
+    assert message["event"] == {
+        "transitions": [_record("switch.one", True), _record("switch.two", False)]
+    }